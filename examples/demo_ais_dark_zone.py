@@ -1,5 +1,6 @@
 # demo_ais_pretty.py
 import datetime as dt
+import numpy as np
 import polars as pl
 from polium import PoliumMap
 
@@ -12,21 +13,30 @@ df = pl.DataFrame({
     "lat":  [51.50, 51.505, 51.510, 51.620, 51.630],
     "lon":  [-0.20, -0.190, -0.180, -0.050, -0.040],
     "sog_kn":[12.0, 12.8, 12.3, 11.5, 11.0],
-})
+}).sort("time")  # the pairwise time diff below is only meaningful on time-ordered rows
 
 m = PoliumMap(TILES, center=(51.54, -0.12), zoom_start=10)
 
-# Optional: range ring (e.g., 22 kn for 2 hours) around last fix before a gap
+# Find the first reporting gap > 30 min in one vectorized pass over the time column.
+gaps = df.select((pl.col("time").diff() > pl.duration(minutes=30)).fill_null(False).alias("g"))["g"].to_numpy()
+times = df["time"]
+lats = df["lat"].to_numpy()
+lons = df["lon"].to_numpy()
+
+# Optional: range ring (e.g., 22 kn for the gap duration) around last fix before a gap
 NM = 1852.0
-gap_hours = 2.0
-max_speed_kn = 22.0
-radius_m = max_speed_kn * gap_hours * NM
-last_pre_gap = df.row(2)  # index of last point before a gap
-m.add_range_ring(center=(float(last_pre_gap[1]), float(last_pre_gap[2])),
-                 radius_m=radius_m,
-                 name="Max reach 2h @ 22 kn",
-                #  tooltip=f"~{radius_m/1000:.1f} km"
-                 )
+if gaps.any():
+    gap_idx = int(np.argmax(gaps)) - 1  # index of last point before the gap
+    gap_hours = (times[gap_idx + 1] - times[gap_idx]).total_seconds() / 3600.0
+    max_speed_kn = 22.0
+    radius_m = max_speed_kn * gap_hours * NM
+    m.add_range_ring(center=(float(lats[gap_idx]), float(lons[gap_idx])),
+                     radius_m=radius_m,
+                     name=f"Max reach {gap_hours:g}h @ 22 kn",
+                    #  tooltip=f"~{radius_m/1000:.1f} km"
+                     )
+else:
+    print("No reporting gap > 30 min; skipping range ring")
 
 
 # Track line with start (green) and end (red) markers.
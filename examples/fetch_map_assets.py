@@ -16,8 +16,10 @@ Optional:
 from __future__ import annotations
 
 import argparse
+import shutil
 import sys
 import textwrap
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
@@ -60,9 +62,8 @@ def download(url: str, dest: Path, force: bool) -> tuple[bool, str]:
     req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
     try:
         with urlopen(req, timeout=60) as r, open(dest, "wb") as f:
-            data = r.read()
-            f.write(data)
-        return True, f"ok   ({len(data):,} B)  {dest.name}"
+            shutil.copyfileobj(r, f, length=64 * 1024)
+        return True, f"ok   ({dest.stat().st_size:,} B)  {dest.name}"
     except HTTPError as e:
         return False, f"HTTP {e.code}  {url}"
     except URLError as e:
@@ -96,11 +97,14 @@ def main() -> int:
 
     print(f"Downloading {len(plan)} files to {dest_dir} …\n")
     failures = []
-    for name, url in plan.items():
-        downloaded, msg = download(url, dest_dir / name, args.force)
-        print(("↓ " if downloaded else "• ") + msg)
-        if msg.startswith("HTTP") or msg.startswith("URL error"):
-            failures.append((name, url))
+    # Downloads are latency-bound, so fetch them concurrently.
+    with ThreadPoolExecutor(max_workers=min(8, len(plan))) as ex:
+        futures = {ex.submit(download, url, dest_dir / name, args.force): (name, url) for name, url in plan.items()}
+        for fut in as_completed(futures):
+            downloaded, msg = fut.result()
+            print(("↓ " if downloaded else "• ") + msg)
+            if msg.startswith("HTTP") or msg.startswith("URL error"):
+                failures.append(futures[fut])
 
     print("\nDone.")
     if failures:
@@ -0,0 +1,87 @@
+# _geodesic_numba.py
+"""Numba-compiled Vincenty direct solution on WGS84, used for geodesic range rings."""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numba import njit
+
+# WGS84 ellipsoid
+_A = 6378137.0
+_F = 1.0 / 298.257223563
+_B = (1.0 - _F) * _A
+
+
+@njit(cache=True, fastmath=True)
+def geodesic_ring(lon: float, lat: float, radius_m: float, n: int) -> np.ndarray:
+    """
+    Points at `radius_m` from (lon, lat) for `n` evenly spaced azimuths.
+
+    Returns an (n + 1, 2) array of [lon, lat] degrees; the last row repeats the first
+    so the ring is closed.
+    """
+    out = np.empty((n + 1, 2))
+    phi1 = math.radians(lat)
+    tan_u1 = (1.0 - _F) * math.tan(phi1)
+    cos_u1 = 1.0 / math.sqrt(1.0 + tan_u1 * tan_u1)
+    sin_u1 = tan_u1 * cos_u1
+
+    for k in range(n):
+        alpha1 = math.radians(360.0 * k / n)
+        sin_a1 = math.sin(alpha1)
+        cos_a1 = math.cos(alpha1)
+
+        sigma1 = math.atan2(tan_u1, cos_a1)
+        sin_alpha = cos_u1 * sin_a1
+        cos2_alpha = 1.0 - sin_alpha * sin_alpha
+        u2 = cos2_alpha * (_A * _A - _B * _B) / (_B * _B)
+        big_a = 1.0 + u2 / 16384.0 * (4096.0 + u2 * (-768.0 + u2 * (320.0 - 175.0 * u2)))
+        big_b = u2 / 1024.0 * (256.0 + u2 * (-128.0 + u2 * (74.0 - 47.0 * u2)))
+
+        # Iterate sigma until it converges (typically < 5 rounds).
+        sigma0 = radius_m / (_B * big_a)
+        sigma = sigma0
+        for _ in range(200):
+            cos_2sm = math.cos(2.0 * sigma1 + sigma)
+            sin_s = math.sin(sigma)
+            cos_s = math.cos(sigma)
+            d_sigma = big_b * sin_s * (
+                cos_2sm
+                + big_b
+                / 4.0
+                * (
+                    cos_s * (-1.0 + 2.0 * cos_2sm * cos_2sm)
+                    - big_b / 6.0 * cos_2sm * (-3.0 + 4.0 * sin_s * sin_s) * (-3.0 + 4.0 * cos_2sm * cos_2sm)
+                )
+            )
+            prev = sigma
+            sigma = sigma0 + d_sigma
+            if abs(sigma - prev) < 1e-12:
+                break
+
+        cos_2sm = math.cos(2.0 * sigma1 + sigma)
+        sin_s = math.sin(sigma)
+        cos_s = math.cos(sigma)
+        x = sin_u1 * sin_s - cos_u1 * cos_s * cos_a1
+        phi2 = math.atan2(
+            sin_u1 * cos_s + cos_u1 * sin_s * cos_a1,
+            (1.0 - _F) * math.sqrt(sin_alpha * sin_alpha + x * x),
+        )
+        lam = math.atan2(sin_s * sin_a1, cos_u1 * cos_s - sin_u1 * sin_s * cos_a1)
+        c = _F / 16.0 * cos2_alpha * (4.0 + _F * (4.0 - 3.0 * cos2_alpha))
+        big_l = lam - (1.0 - c) * _F * sin_alpha * (
+            sigma + c * sin_s * (cos_2sm + c * cos_s * (-1.0 + 2.0 * cos_2sm * cos_2sm))
+        )
+
+        lon2 = lon + math.degrees(big_l)
+        if lon2 > 180.0:
+            lon2 -= 360.0
+        elif lon2 < -180.0:
+            lon2 += 360.0
+        out[k, 0] = lon2
+        out[k, 1] = math.degrees(phi2)
+
+    out[n, 0] = out[0, 0]
+    out[n, 1] = out[0, 1]
+    return out
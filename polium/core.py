@@ -1,21 +1,27 @@
 # polium.py
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+import io
 from pathlib import Path
 import re
+import threading
 from typing import Any, Iterable, List, Optional, Tuple
 
 import folium
+import numpy as np
 import polars as pl
-from branca.colormap import LinearColormap
+from branca.colormap import ColorMap, LinearColormap
+from branca.element import MacroElement
 from folium import GeoJson, Map, Marker, Popup, Tooltip
 from folium.plugins import MarkerCluster, TimestampedGeoJson, AntPath
+from folium.template import Template
 
 # ----- Optional deps -----
 try:
-    from shapely.geometry import mapping  # type: ignore
+    from shapely.geometry import LineString, mapping  # type: ignore
     from shapely.geometry.base import BaseGeometry  # type: ignore
 
     _HAS_SHAPELY = True
@@ -37,8 +43,32 @@ try:
 except Exception:  # pragma: no cover
     _HAS_PYPROJ = False
 
+# Built once; PROJ context setup is not free and rings are often drawn in bulk.
+_GEOD_WGS84 = pyproj.Geod(ellps="WGS84") if _HAS_PYPROJ else None
+
+# The Numba kernel is only a fallback for when pyproj is missing: its import and JIT/cache
+# load cost far more than pyproj's vectorized fwd() unless thousands of rings are drawn.
+_HAS_NUMBA = False
+if not _HAS_PYPROJ:
+    try:
+        from polium._geodesic_numba import geodesic_ring as _geodesic_ring_numba  # type: ignore
+
+        _HAS_NUMBA = True
+    except Exception:  # pragma: no cover
+        _HAS_NUMBA = False
+
+try:
+    import orjson  # type: ignore
+
+    _HAS_ORJSON = True
+except Exception:  # pragma: no cover
+    _HAS_ORJSON = False
+
 # ----- Small helpers -----
 
+# add_dots switches to add_dots_fast (one _DotsLayer: a JSON array drawn by a client-side loop) above this many rows.
+_FAST_DOTS_MIN_ROWS = 1000
+
 # --- Offline asset rewriting (remove all CDN calls) ---
 
 # Known CDN patterns used by folium & plugins (Leaflet, TimeDimension, AntPath)
@@ -70,6 +100,15 @@ _CDN_PATTERNS: dict[str, re.Pattern[str]] = {
     "osm_tiles": re.compile(r"https://tile\.openstreetmap\.org/\{z\}/\{x\}/\{y\}\.png"),
 }
 
+# All of the above as one alternation; match.lastgroup names the asset key.
+_COMBINED_CDN = re.compile("|".join(f"(?P<{k}>{p.pattern})" for k, p in _CDN_PATTERNS.items()))
+
+# Quoted http(s) URLs left in the output, skipping local tile servers (strict_offline check).
+_EXTERNAL_URL_RE = re.compile(r"""["'](?!http://127\.0\.0\.1|http://localhost)(https?://[^"']+)["']""")
+
+# <script ...>...</script> (or self-closing) and <link ...> tags, for the inline-embedding pass.
+_TAG_RE = re.compile(r"<script\b[^>]*?(?:/>|>.*?</script>)|<link\b[^>]*?/?>", re.DOTALL)
+
 def _rewrite_external_assets(
     html: str,
     assets_dir: str | None,
@@ -85,6 +124,10 @@ def _rewrite_external_assets(
     extra_map  : explicit overrides {key: local_path}; keys are those in _CDN_PATTERNS
     tiles_fallback : if an OSM tile URL is found, replace with this tiles template
     """
+    if "http" not in html:
+        # Every asset pattern starts with http(s)://, so there is nothing to rewrite.
+        return html
+
     replacements: dict[str, str] = {}
 
     if assets_dir:
@@ -117,13 +160,26 @@ def _rewrite_external_assets(
     if tiles_fallback:
         replacements["osm_tiles"] = tiles_fallback
 
-    # Do the substitutions
-    for key, pat in _CDN_PATTERNS.items():
-        local = replacements.get(key)
-        if local:
-            html = pat.sub(local, html)
+    # Do the substitutions in a single pass over the HTML
+    return _COMBINED_CDN.sub(lambda m: replacements.get(m.lastgroup) or m.group(0), html)
+
+
+# (path, mtime, kind) -> wrapped asset block, in LRU order; mtime in the key invalidates edited files.
+_WRAPPED_CACHE: dict[tuple[str, float, str], str] = {}
+_WRAPPED_CACHE_MAX = 64
+# Guards _WRAPPED_CACHE lookups, reinserts and evictions across concurrent save() calls.
+_WRAPPED_LOCK = threading.Lock()
 
-    return html
+
+def _read_wrapped(path_str: str, kind: str) -> Optional[str]:
+    """Asset file wrapped as an inline <script>/<style> block; None if it can't be read."""
+    try:
+        content = Path(path_str).read_text(encoding="utf-8")
+    except Exception:
+        # If we can't read a file, skip it (it might not be needed for this map)
+        return None
+    tag = "script" if kind == "js" else "style"
+    return f"<{tag}>\n{content}\n</{tag}>"
 
 
 def _embed_inline_assets(
@@ -144,6 +200,10 @@ def _embed_inline_assets(
     extra_map  : explicit overrides {key: local_path}; keys are those in _CDN_PATTERNS
     tiles_fallback : if an OSM tile URL is found, replace with this tiles template
     """
+    if "http" not in html:
+        # No CDN or OSM tile URL can be present; skip the tile and tag passes.
+        return html
+
     replacements: dict[str, Path] = {}
 
     if assets_dir:
@@ -176,73 +236,67 @@ def _embed_inline_assets(
     if tiles_fallback:
         html = _CDN_PATTERNS["osm_tiles"].sub(tiles_fallback, html)
 
-    # Embed each asset inline
-    for key, pat in _CDN_PATTERNS.items():
-        if key == "osm_tiles":
-            continue  # Already handled above
-
+    def cache_key(key: str) -> Optional[tuple[str, float, str]]:
+        """_WRAPPED_CACHE key for `key`'s asset file; None if it has no existing file."""
         asset_path = replacements.get(key)
-        if asset_path and asset_path.exists():
-            try:
-                content = asset_path.read_text(encoding="utf-8")
-
-                # Determine if this is JS or CSS based on the key suffix
-                if key.endswith("_js"):
-                    # Wrap in inline script tag
-                    inline_content = f"<script>\n{content}\n</script>"
-                    # Match any script tag containing this URL pattern
-                    # We search for the URL first, then replace the whole tag
-                    matches = list(pat.finditer(html))
-                    for match in reversed(matches):  # Reverse to maintain string positions
-                        url = match.group(0)
-                        # Find the script tag containing this URL
-                        # Look backwards and forwards from the URL position to find the tag boundaries
-                        start_pos = match.start()
-                        end_pos = match.end()
-
-                        # Find the opening <script tag before this URL
-                        script_start = html.rfind('<script', 0, start_pos)
-                        if script_start == -1:
-                            continue
-
-                        # Find the closing </script> after this URL
-                        script_end = html.find('</script>', end_pos)
-                        if script_end == -1:
-                            continue
-                        script_end += len('</script>')
-
-                        # Replace the entire script tag with inline content
-                        html = html[:script_start] + inline_content + html[script_end:]
-
-                elif key.endswith("_css"):
-                    # Wrap in inline style tag
-                    inline_content = f"<style>\n{content}\n</style>"
-                    # Match any link tag containing this URL pattern
-                    matches = list(pat.finditer(html))
-                    for match in reversed(matches):  # Reverse to maintain string positions
-                        url = match.group(0)
-                        start_pos = match.start()
-                        end_pos = match.end()
-
-                        # Find the opening <link tag before this URL
-                        link_start = html.rfind('<link', 0, start_pos)
-                        if link_start == -1:
-                            continue
-
-                        # Find the end of the link tag (either /> or >)
-                        link_end = html.find('>', end_pos)
-                        if link_end == -1:
-                            continue
-                        link_end += 1
-
-                        # Replace the entire link tag with inline content
-                        html = html[:link_start] + inline_content + html[link_end:]
-
-            except Exception as e:
-                # If we can't read a file, skip it (it might not be needed for this map)
-                pass
-
-    return html
+        if not asset_path:
+            return None
+        try:
+            mtime = asset_path.stat().st_mtime
+        except OSError:
+            return None
+        return (str(asset_path), mtime, "js" if key.endswith("_js") else "css")
+
+    # One linear pass over every <script>/<link> tag to find the ones pointing at a known asset.
+    edits: list[tuple[int, int, str]] = []
+    for tag in _TAG_RE.finditer(html):
+        text = tag.group(0)
+        is_script = text.startswith("<script")
+        # Only look at a script's opening tag, so inline code mentioning a CDN URL is left alone.
+        opening = text[: text.find(">") + 1] if is_script else text
+        hit = _COMBINED_CDN.search(opening)
+        if hit is None:
+            continue
+        key = hit.lastgroup
+        if key is None or not key.endswith("_js" if is_script else "_css"):
+            continue
+        edits.append((tag.start(), tag.end(), key))
+
+    # Only cache misses are read, concurrently when there are several (file reads release the GIL);
+    # a warm save costs one stat() per asset and never starts a pool.
+    ckeys = {key: cache_key(key) for key in dict.fromkeys(key for _, _, key in edits)}
+    distinct = [ck for ck in dict.fromkeys(ckeys.values()) if ck is not None]
+    with _WRAPPED_LOCK:
+        cached = {ck: _WRAPPED_CACHE[ck] for ck in distinct if ck in _WRAPPED_CACHE}
+    misses = [ck for ck in distinct if ck not in cached]
+    if len(misses) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(misses))) as ex:
+            loaded = list(ex.map(_read_wrapped, [ck[0] for ck in misses], [ck[2] for ck in misses]))
+    else:
+        loaded = [_read_wrapped(ck[0], ck[2]) for ck in misses]
+    found = {**cached, **dict(zip(misses, loaded))}
+
+    with _WRAPPED_LOCK:
+        for ck in distinct:
+            _WRAPPED_CACHE.pop(ck, None)
+            if found[ck] is not None:
+                _WRAPPED_CACHE[ck] = found[ck]  # (re)insert as most recently used
+        while len(_WRAPPED_CACHE) > _WRAPPED_CACHE_MAX:
+            del _WRAPPED_CACHE[next(iter(_WRAPPED_CACHE))]
+    blocks: dict[str, Optional[str]] = {key: None if ck is None else found[ck] for key, ck in ckeys.items()}
+
+    # Swap matching tags for inline content and assemble the result with a single join.
+    parts: list[str] = []
+    pos = 0
+    for start, end, key in edits:
+        block = blocks[key]
+        if block is None:
+            continue
+        parts.append(html[pos:start])
+        parts.append(block)
+        pos = end
+    parts.append(html[pos:])
+    return "".join(parts)
 
 
 def _ensure_latlon(df: pl.DataFrame, lat: str, lon: str) -> None:
@@ -250,38 +304,190 @@ def _ensure_latlon(df: pl.DataFrame, lat: str, lon: str) -> None:
         raise KeyError(f"DataFrame must contain '{lat}' and '{lon}' columns.")
 
 
-def _infer_center(df: pl.DataFrame, lat: str, lon: str) -> tuple[float, float]:
+def _latlon_arrays(df: pl.DataFrame, lat: str, lon: str) -> np.ndarray:
+    """Validated (2, n) float64 array of [lats, lons] from one select; nulls become NaN."""
     _ensure_latlon(df, lat, lon)
-    la = df[lat].cast(pl.Float64)
-    lo = df[lon].cast(pl.Float64)
-    return float(la.mean()), float(lo.mean())
+    return df.select(pl.col(lat).cast(pl.Float64), pl.col(lon).cast(pl.Float64)).to_numpy().T
 
 
-def _popup_text(row: dict, keys: list[str]) -> str:
-    parts: list[str] = []
-    for k in keys:
-        if k in row and row[k] is not None:
-            parts.append(f"<b>{k}</b>: {row[k]}")
-    return "<br/>".join(parts)
+def _infer_center(df: pl.DataFrame, lat: str, lon: str) -> tuple[float, float]:
+    _ensure_latlon(df, lat, lon)
+    # Both means in one select so Polars scans the frame once.
+    la, lo = df.select(
+        pl.col(lat).cast(pl.Float64).mean().alias("la"),
+        pl.col(lon).cast(pl.Float64).mean().alias("lo"),
+    ).row(0)
+    return float(la), float(lo)
 
 
-def _colormap(values: Iterable[float] | None, cmap: Optional[LinearColormap]) -> LinearColormap:
+def _popup_texts(df: pl.DataFrame, keys: list[str]) -> list[str]:
+    """
+    Popup HTML for every row. Each requested column is formatted into "<b>k</b>: v"
+    segments once (None for nulls, which are omitted), then rows are joined in one pass.
+    """
+    present = [k for k in keys if k in df.columns]
+    if not present:
+        return [""] * df.height
+    segs: list[list[Optional[str]]] = []
+    for k in present:
+        prefix = f"<b>{k}</b>: "
+        segs.append([None if v is None else f"{prefix}{v}" for v in df[k].to_list()])
+    if not any(df[k].null_count() for k in present):
+        return list(map("<br/>".join, zip(*segs)))
+    return ["<br/>".join([p for p in parts if p is not None]) for parts in zip(*segs)]
+
+
+def _time_strings(s: pl.Series) -> list[str]:
+    """
+    Per-row time strings matching `datetime.isoformat()` (`str()` for other dtypes).
+    Datetime columns are formatted in Polars instead of row by row in Python.
+    """
+    if not isinstance(s.dtype, pl.Datetime):
+        return [t.isoformat() if isinstance(t, datetime) else str(t) for t in s.to_list()]
+    s = s.dt.cast_time_unit("us")  # Python datetimes carry microseconds at most
+    tz = "%:z" if s.dtype.time_zone else ""
+    return pl.select(
+        pl.when(s.dt.microsecond() == 0)
+        .then(s.dt.strftime("%Y-%m-%dT%H:%M:%S" + tz))
+        .otherwise(s.dt.strftime("%Y-%m-%dT%H:%M:%S%.6f" + tz))
+        .fill_null("None")
+    ).to_series().to_list()
+
+
+_DEFAULT_COLORS = ("#440154", "#21908C", "#FDE725")
+
+
+def _colormap(
+    values: pl.Series | Iterable[float] | None,
+    cmap: Optional[LinearColormap],
+    cache: Optional[dict[tuple, LinearColormap]] = None,
+) -> LinearColormap:
+    """
+    `cmap` if given, else a viridis-like colormap over the value range. With `cache`,
+    layers sharing a range get the same instance, and so a single legend.
+    """
     if cmap is not None:
         return cmap
-    vals: list[float] = []
-    if values is not None:
-        for v in values:
-            try:
-                vals.append(float(v))
-            except Exception:
-                pass
-    if not vals:
-        return LinearColormap(["#440154", "#21908C", "#FDE725"], vmin=0.0, vmax=1.0)
-    vmin = min(vals)
-    vmax = max(vals)
+    vmin, vmax = 0.0, 1.0
+    if isinstance(values, pl.Series):
+        # Bounds straight from Polars; non-numeric cells and NaN are ignored like below.
+        s = values.cast(pl.Float64, strict=False).fill_nan(None)
+        lo, hi = s.min(), s.max()
+        if lo is not None and hi is not None:
+            vmin, vmax = float(lo), float(hi)
+    else:
+        vals: list[float] = []
+        if values is not None:
+            for v in values:
+                try:
+                    vals.append(float(v))
+                except Exception:
+                    pass
+        if vals:
+            vmin = min(vals)
+            vmax = max(vals)
     if abs(vmax - vmin) < 1e-12:
         vmax = vmin + 1e-9
-    return LinearColormap(["#440154", "#21908C", "#FDE725"], vmin=vmin, vmax=vmax)
+    key = (vmin, vmax, _DEFAULT_COLORS)
+    if cache is not None and key in cache:
+        return cache[key]
+    col = LinearColormap(list(_DEFAULT_COLORS), vmin=vmin, vmax=vmax)
+    if cache is not None:
+        cache[key] = col
+    return col
+
+
+def _vectorize_cmap(col: ColorMap, values: np.ndarray, default: str) -> list[str]:
+    """
+    Hex colors for `values`; NaN maps to `default`. For a LinearColormap this matches
+    `col(v)` exactly but interpolates RGBA between the knots in one NumPy pass, the same
+    way branca does. Any other colormap (e.g. StepColormap) gets `col(v)` once per distinct value.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    nan = np.isnan(values)
+    if not isinstance(col, LinearColormap):
+        uniq, inv = np.unique(np.where(nan, 0.0, values), return_inverse=True)
+        hexes = [col(u) for u in uniq.tolist()]
+        return [default if m else hexes[j] for j, m in zip(inv.tolist(), nan.tolist())]
+    knots = np.asarray(col.index, dtype=np.float64)
+    rgba = np.asarray(col.colors, dtype=np.float64)  # (k, 4) floats in [0, 1]
+    x = np.where(nan, knots[0], values)
+
+    i = np.clip(np.searchsorted(knots, x, side="left"), 1, len(knots) - 1)
+    lo, hi = knots[i - 1], knots[i]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(hi > lo, (x - lo) / (hi - lo), 1.0)
+        # +-inf rows give NaN here; the clamps below overwrite them.
+        chans = (1.0 - p)[:, None] * rgba[i - 1] + p[:, None] * rgba[i]
+    chans[x >= knots[-1]] = rgba[-1]
+    chans[x <= knots[0]] = rgba[0]  # branca checks the lower bound first
+
+    # Pack to one int per color so each distinct color is string-formatted only once.
+    b = (chans * 255.9999).astype(np.uint32)
+    packed = (b[:, 0] << 24) | (b[:, 1] << 16) | (b[:, 2] << 8) | b[:, 3]
+    uniq, inv = np.unique(packed, return_inverse=True)
+    hexes = ["#%08x" % u for u in uniq.tolist()]
+    return [default if m else hexes[j] for j, m in zip(inv.tolist(), nan.tolist())]
+
+
+def _dot_columns(
+    df: pl.DataFrame,
+    lat: str,
+    lon: str,
+    value: Optional[str],
+    cmap: Optional[LinearColormap],
+    default_fill: str,
+    tooltip: Optional[str],
+    popup: Optional[List[str]],
+    cmap_cache: Optional[dict[tuple, LinearColormap]] = None,
+) -> tuple[list[float], list[float], list[str], Optional[list], Optional[list[str]], LinearColormap]:
+    """Per-row inputs shared by the dot renderers: (lats, lons, fills, tooltips, popups, colormap)."""
+    # Pull each needed column once instead of materializing a dict per row.
+    lat_arr, lon_arr = _latlon_arrays(df, lat, lon)
+    vals = df[value] if (value and value in df.columns) else None
+    col = _colormap(vals, cmap, cmap_cache)
+    if vals is not None:
+        val_arr = df[value].cast(pl.Float64, strict=False).to_numpy()
+        fills = _vectorize_cmap(col, val_arr, default_fill)
+    else:
+        fills = [default_fill] * df.height
+    tips = df[tooltip].to_list() if (tooltip and tooltip in df.columns) else None
+    popups = _popup_texts(df, popup) if popup else None
+    return lat_arr.tolist(), lon_arr.tolist(), fills, tips, popups, col
+
+
+class _DotsLayer(MacroElement):
+    """
+    All dots of one layer as a single JSON array, drawn client-side with L.circleMarker.
+
+    Rows are [lat, lon, fill, tooltip, popup]; tooltip/popup may be null.
+    One template render regardless of row count, unlike one CircleMarker per row.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        (function() {
+            var data = {{ this.data|tojson }};
+            var opts = {{ this.options|tojson }};
+            var layer = {{ this._parent.get_name() }};
+            for (var i = 0; i < data.length; i++) {
+                var d = data[i];
+                var m = L.circleMarker([d[0], d[1]], Object.assign({fillColor: d[2]}, opts));
+                if (d[3] !== null) { m.bindTooltip(d[3], {sticky: true}); }
+                if (d[4] !== null) { m.bindPopup(d[4], {maxWidth: 300}); }
+                m.addTo(layer);
+            }
+        })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, data: list[list[Any]], options: dict[str, Any]) -> None:
+        super().__init__()
+        self._name = "DotsLayer"
+        self.data = data
+        self.options = options
 
 
 def _to_geojson_geom(geom: Any) -> dict:
@@ -291,7 +497,10 @@ def _to_geojson_geom(geom: Any) -> dict:
     if _HAS_SHAPELY and isinstance(geom, BaseGeometry):  # type: ignore[arg-type]
         return mapping(geom)  # type: ignore[misc]
     if isinstance(geom, (list, tuple)) and geom and isinstance(geom[0], (list, tuple)):
-        ring = [[float(x), float(y)] for x, y in geom]
+        arr = np.asarray(geom, dtype=np.float64)
+        if arr.ndim != 2 or arr.shape[1] != 2:
+            raise TypeError("Ring coordinates must be a list of [lon,lat] pairs.")
+        ring = arr.tolist()
         if ring[0] != ring[-1]:
             ring.append(ring[0])
         return {"type": "Polygon", "coordinates": [ring]}
@@ -306,25 +515,53 @@ def _h3_boundary(cell: str) -> list[list[float]]:
     if not _HAS_H3:
         raise RuntimeError("h3 not installed. pip install 'h3>=4,<5'  (or h3==3.7.7)")
     if hasattr(h3, "h3_to_geo_boundary"):
-        return h3.h3_to_geo_boundary(cell, geo_json=True)  # v3 → [(lat,lon), ...]
-    return h3.cell_to_boundary(cell, geo_json=True)  # v4
+        return h3.h3_to_geo_boundary(cell)  # v3 → [(lat,lon), ...]
+    return h3.cell_to_boundary(cell)  # v4 → ((lat,lon), ...)
+
+
+def _h3_ring(cell: str) -> list[list[float]]:
+    """Closed GeoJSON ring ([[lon,lat], ...]) for one H3 cell."""
+    boundary = np.asarray(_h3_boundary(cell), dtype=np.float64)  # [(lat,lon), ...]
+    coords = boundary[:, ::-1].tolist()  # → [[lon,lat], ...]
+    if coords and coords[0] != coords[-1]:
+        coords.append(coords[0])
+    return coords
 
 
 def _geodesic_circle(lon: float, lat: float, radius_m: float, n: int = 256) -> List[List[float]]:
     if not _HAS_PYPROJ:
-        raise RuntimeError("pyproj required for geodesic ring. Install with: pip install pyproj")
-    geod = pyproj.Geod(ellps="WGS84")
-    coords: List[List[float]] = []
-    step = 360.0 / n
-    a = 0.0
-    for _ in range(n):
-        lon2, lat2, _ = geod.fwd(lon, lat, a, radius_m)
-        coords.append([lon2, lat2])
-        a += step
+        if _HAS_NUMBA:
+            return _geodesic_ring_numba(float(lon), float(lat), float(radius_m), int(n)).tolist()
+        raise RuntimeError("pyproj (or numba) required for geodesic ring. Install with: pip install pyproj")
+    geod = _GEOD_WGS84
+    # One vectorized fwd() call for all azimuths instead of n scalar calls.
+    az = np.linspace(0.0, 360.0, n, endpoint=False)
+    lon2, lat2, _ = geod.fwd(np.full(n, lon), np.full(n, lat), az, np.full(n, radius_m))
+    coords: List[List[float]] = np.column_stack([lon2, lat2]).tolist()
     coords.append(coords[0])
     return coords
 
 
+def _tree_fingerprint(element: Any) -> int:
+    """
+    Hash of every element name under `element`, plus the children of its Figure's
+    header/html/script sections; changes whenever a child is added or removed.
+    """
+    names: list[str] = []
+    stack = [element]
+    while stack:
+        el = stack.pop()
+        names.append(el.get_name())
+        stack.extend(el._children.values())
+    # The sections' own names are regenerated on every render, so key on their children's keys.
+    root = element.get_root()
+    if root is not element:
+        for section in (root.header, root.html, root.script):
+            names.append("|")
+            names.extend(section._children.keys())
+    return hash(tuple(names))
+
+
 @dataclass
 class PoliumMap:
     """Minimal Polars → Folium wrapper using a local tileserver. AIS-friendly visuals by default."""
@@ -348,6 +585,21 @@ class PoliumMap:
             overlay=False,
             control=True,
         ).add_to(self._map)
+        # (tree fingerprint, rendered html); reset by every add_* call
+        self._render_cache: Optional[tuple[int, str]] = None
+        # (vmin, vmax, colors) -> auto-built colormap, so layers sharing a range share one legend
+        self._colormap_cache: dict[tuple, LinearColormap] = {}
+
+    def _add_legend(self, col: LinearColormap, caption: str) -> None:
+        """Attach `col` as a legend; a colormap already on the map keeps one legend listing every caption."""
+        if col.get_name() in self._map._children and col.caption:
+            captions = col.caption.split(" / ")
+            if caption not in captions:
+                caption = " / ".join(captions + [caption])
+            else:
+                caption = col.caption
+        col.caption = caption
+        col.add_to(self._map)
 
     # ---------- AIS-friendly dots (CircleMarker) ----------
 
@@ -368,49 +620,126 @@ class PoliumMap:
         tooltip: Optional[str] = None,
         popup: Optional[List[str]] = None,
         name: str = "dots",
+        fast: Optional[bool] = None,
     ) -> "PoliumMap":
         """
         Plot each row as a small vector dot (CircleMarker). Fast and clean for AIS.
         If `value` provided, colors by a LinearColormap and adds a legend.
+        `fast=True` renders via `add_dots_fast` (one embedded layer instead of one
+        CircleMarker per row); the default (None) does so for frames over 1000 rows.
         """
-        _ensure_latlon(df, lat, lon)
+        if fast is None:
+            fast = df.height > _FAST_DOTS_MIN_ROWS
+        if fast:
+            return self.add_dots_fast(
+                df,
+                lat,
+                lon,
+                value=value,
+                cmap=cmap,
+                radius=radius,
+                stroke=stroke,
+                stroke_color=stroke_color,
+                stroke_weight=stroke_weight,
+                fill_opacity=fill_opacity,
+                default_fill=default_fill,
+                tooltip=tooltip,
+                popup=popup,
+                name=name,
+            )
         if self._map.location == [0.0, 0.0] and df.height:
             self._map.location = list(_infer_center(df, lat, lon))
 
-        vals = df[value].to_list() if (value and value in df.columns) else None
-        col = _colormap(vals, cmap)
+        lats, lons, fills, tips, popups, col = _dot_columns(
+            df, lat, lon, value, cmap, default_fill, tooltip, popup, self._colormap_cache
+        )
 
         group = folium.FeatureGroup(name=name, show=True)
+        marker_kw: dict[str, Any] = {
+            "radius": radius,
+            "color": stroke_color if stroke else None,
+            "weight": stroke_weight if stroke else 0,
+            "fill": True,
+            "fill_opacity": fill_opacity,
+            "opacity": 1.0 if stroke else 0.0,
+        }
 
-        for row in df.to_dicts():
-            la = float(row[lat])
-            lo = float(row[lon])
-            fill = default_fill
-            if value and value in row and row[value] is not None:
-                try:
-                    fill = col(float(row[value]))
-                except Exception:
-                    pass
-            cm = folium.CircleMarker(
-                location=(la, lo),
-                radius=radius,
-                color=stroke_color if stroke else None,
-                weight=stroke_weight if stroke else 0,
-                fill=True,
-                fill_color=fill,
-                fill_opacity=fill_opacity,
-                opacity=1.0 if stroke else 0.0,
-            )
-            if tooltip and tooltip in row:
-                cm.add_child(Tooltip(str(row[tooltip])))
-            if popup:
-                cm.add_child(Popup(_popup_text(row, popup), max_width=300))
-            cm.add_to(group)
+        def dot(la: float, lo: float, fill: str) -> folium.CircleMarker:
+            return folium.CircleMarker(location=(la, lo), fill_color=fill, **marker_kw)
+
+        # Tooltip/popup presence is fixed per call, so pick the loop once instead of branching per row.
+        if tips is None and popups is None:
+            for la, lo, fill in zip(lats, lons, fills):
+                dot(la, lo, fill).add_to(group)
+        elif popups is None:
+            for la, lo, fill, tip in zip(lats, lons, fills, tips):
+                dot(la, lo, fill).add_child(Tooltip(str(tip))).add_to(group)
+        elif tips is None:
+            for la, lo, fill, html in zip(lats, lons, fills, popups):
+                dot(la, lo, fill).add_child(Popup(html, max_width=300)).add_to(group)
+        else:
+            for la, lo, fill, tip, html in zip(lats, lons, fills, tips, popups):
+                dot(la, lo, fill).add_child(Tooltip(str(tip))).add_child(Popup(html, max_width=300)).add_to(group)
 
         group.add_to(self._map)
         if value:
-            col.caption = f"{name}: {value}"
-            col.add_to(self._map)
+            self._add_legend(col, f"{name}: {value}")
+        self._render_cache = None
+        return self
+
+    def add_dots_fast(
+        self,
+        df: pl.DataFrame,
+        lat: str = "lat",
+        lon: str = "lon",
+        *,
+        value: Optional[str] = None,
+        cmap: Optional[LinearColormap] = None,
+        radius: int = 4,
+        stroke: bool = True,
+        stroke_color: str = "#ffffff",
+        stroke_weight: int = 1,
+        fill_opacity: float = 0.85,
+        default_fill: str = "#1f77b4",
+        tooltip: Optional[str] = None,
+        popup: Optional[List[str]] = None,
+        name: str = "dots",
+    ) -> "PoliumMap":
+        """
+        Same look as `add_dots`, but all dots are embedded as one JSON array and drawn
+        by a single client-side loop instead of one CircleMarker per row.
+        Much smaller HTML and faster save() for large AIS frames.
+        """
+        if self._map.location == [0.0, 0.0] and df.height:
+            self._map.location = list(_infer_center(df, lat, lon))
+
+        lats, lons, fills, tips, popups, col = _dot_columns(
+            df, lat, lon, value, cmap, default_fill, tooltip, popup, self._colormap_cache
+        )
+        # CircleMarker rejects these in Python; in the browser they'd abort the whole draw loop.
+        if np.isnan(lats).any() or np.isnan(lons).any():
+            raise ValueError("Location values cannot contain NaNs.")
+        tip_strs = [str(t) for t in tips] if tips is not None else [None] * len(lats)
+        pop_strs = popups if popups is not None else [None] * len(lats)
+        data = [list(r) for r in zip(lats, lons, fills, tip_strs, pop_strs)]
+
+        options: dict[str, Any] = {
+            "radius": radius,
+            "stroke": stroke,
+            "weight": stroke_weight if stroke else 0,
+            "opacity": 1.0 if stroke else 0.0,
+            "fill": True,
+            "fillOpacity": fill_opacity,
+        }
+        if stroke:
+            options["color"] = stroke_color
+
+        group = folium.FeatureGroup(name=name, show=True)
+        _DotsLayer(data, options).add_to(group)
+        group.add_to(self._map)
+        if value:
+            self._add_legend(col, f"{name}: {value}")
+        self._render_cache = None
         return self
 
     # ---------- Optional: classic pin markers (kept for completeness) ----------
@@ -426,26 +755,28 @@ class PoliumMap:
         name: str = "points",
     ) -> "PoliumMap":
         """Classic pin markers; prefer `add_dots` for AIS."""
-        _ensure_latlon(df, lat, lon)
+        lat_arr, lon_arr = _latlon_arrays(df, lat, lon)
         if self._map.location == [0.0, 0.0] and df.height:
             self._map.location = list(_infer_center(df, lat, lon))
 
         group = folium.FeatureGroup(name=name, show=True)
         container: Any = MarkerCluster(name=name) if cluster else group
 
-        for row in df.to_dicts():
-            la = float(row[lat])
-            lo = float(row[lon])
+        tips = df[tooltip].to_list() if (tooltip and tooltip in df.columns) else None
+        popups = _popup_texts(df, popup) if popup else None
+
+        for i, (la, lo) in enumerate(zip(lat_arr.tolist(), lon_arr.tolist())):
             m = Marker(location=(la, lo))
-            if popup:
-                m.add_child(Popup(_popup_text(row, popup), max_width=300))
-            if tooltip and tooltip in row:
-                m.add_child(Tooltip(str(row[tooltip])))
+            if popups is not None:
+                m.add_child(Popup(popups[i], max_width=300))
+            if tips is not None:
+                m.add_child(Tooltip(str(tips[i])))
             m.add_to(container)
 
         if cluster:
             container.add_to(group)
         group.add_to(self._map)
+        self._render_cache = None
         return self
 
     # ---------- Time points (always-on plugin; not toggleable in LayerControl) ----------
@@ -461,26 +792,32 @@ class PoliumMap:
         period: str = "P1D",
         name: str = "time-points",  # kept for API symmetry
     ) -> "PoliumMap":
-        _ensure_latlon(df, lat, lon)
-        feats: list[dict[str, Any]] = []
-        for row in df.to_dicts():
-            t = row[time]
-            ts = t.isoformat() if isinstance(t, datetime) else str(t)
-            props: dict[str, Any] = {"time": ts}
-            if tooltip and tooltip in row:
-                props["tooltip"] = str(row[tooltip])
-            if popup:
-                props["popup"] = _popup_text(row, popup)
-            feats.append(
-                {
-                    "type": "Feature",
-                    "geometry": {"type": "Point", "coordinates": [float(row[lon]), float(row[lat])]},
-                    "properties": props,
-                }
-            )
-
+        lat_arr, lon_arr = _latlon_arrays(df, lat, lon)
+        # Nulls arrive as NaN; Leaflet would reject them client-side and drop the whole time layer.
+        if not (np.isfinite(lat_arr).all() and np.isfinite(lon_arr).all()):
+            raise ValueError("Location values cannot contain NaNs.")
+        tips = df[tooltip].to_list() if (tooltip and tooltip in df.columns) else None
+        popups = _popup_texts(df, popup) if popup else None
+
+        # Build properties column-wise, then assemble all features in one comprehension.
+        props: list[dict[str, Any]] = [{"time": t} for t in _time_strings(df[time])]
+        if tips is not None:
+            for p, tip in zip(props, tips):
+                p["tooltip"] = str(tip)
+        if popups is not None:
+            for p, html in zip(props, popups):
+                p["popup"] = html
+        feats = [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lo, la]}, "properties": p}
+            for la, lo, p in zip(lat_arr.tolist(), lon_arr.tolist(), props)
+        ]
+
+        fc: Any = {"type": "FeatureCollection", "features": feats}
+        if _HAS_ORJSON:
+            # TimestampedGeoJson embeds a file-like's text verbatim; reading it keeps get_bounds() working.
+            fc = io.StringIO(orjson.dumps(fc).decode("utf-8"))
         TimestampedGeoJson(
-            {"type": "FeatureCollection", "features": feats},
+            fc,
             period=period,
             transition_time=200,
             add_last_point=True,
@@ -488,6 +825,7 @@ class PoliumMap:
             loop=False,
             duration="P1D",
         ).add_to(self._map)
+        self._render_cache = None
         return self
 
     # ---------- Choropleth + H3 (unchanged APIs) ----------
@@ -504,22 +842,26 @@ class PoliumMap:
     ) -> "PoliumMap":
         if geometry not in df.columns:
             raise KeyError(f"Expected a '{geometry}' column with polygons.")
-        feats: list[dict[str, Any]] = []
-        vals: list[float] = []
-        for row in df.to_dicts():
-            gj = _to_geojson_geom(row[geometry])
-            props: dict[str, Any] = {}
-            if value is not None:
-                v = float(row[value])
-                props["value"] = v
-                vals.append(v)
-            feats.append({"type": "Feature", "geometry": gj, "properties": props})
-        col = _colormap(vals, cmap)
+        # Only the geometry and value columns are pulled; values are cast once in Polars.
+        vals = df[value].cast(pl.Float64) if value is not None else None
+        props: list[dict[str, Any]] = (
+            [{"value": v} for v in vals.to_list()] if vals is not None else [{} for _ in range(df.height)]
+        )
+        feats = [
+            {"type": "Feature", "geometry": _to_geojson_geom(g), "properties": p}
+            for g, p in zip(df[geometry].to_list(), props)
+        ]
+        col = _colormap(vals, cmap, self._colormap_cache)
+        # Every fill computed up front in NumPy; style_fn just looks its value up.
+        fills: dict[float, str] = {}
+        if vals is not None:
+            present = vals.drop_nulls()
+            fills = dict(zip(present.to_list(), _vectorize_cmap(col, present.to_numpy(), "#3388ff")))
 
         def style_fn(feat: dict[str, Any]) -> dict[str, Any]:
             v = feat.get("properties", {}).get("value")
             return {
-                "fillColor": col(v) if v is not None else "#3388ff",
+                "fillColor": fills.get(v, "#3388ff") if v is not None else "#3388ff",
                 "color": "#000000",
                 "weight": 1,
                 "fillOpacity": fill_opacity,
@@ -528,8 +870,8 @@ class PoliumMap:
 
         GeoJson({"type": "FeatureCollection", "features": feats}, name=name, style_function=style_fn).add_to(self._map)
         if value is not None:
-            col.caption = name
-            col.add_to(self._map)
+            self._add_legend(col, name)
+        self._render_cache = None
         return self
 
     def add_h3_hexes(
@@ -550,26 +892,28 @@ class PoliumMap:
             )
         if h3_col not in df.columns:
             raise KeyError(f"Expected an '{h3_col}' column with H3 cells.")
-        feats: list[dict[str, Any]] = []
-        vals: list[float] = []
-        for row in df.to_dicts():
-            cell = str(row[h3_col])
-            boundary = _h3_boundary(cell)  # [(lat,lon), ...]
-            coords = [[lon, lat] for lat, lon in boundary]
-            if coords and coords[0] != coords[-1]:
-                coords.append(coords[0])
-            props: dict[str, Any] = {}
-            if value is not None:
-                v = float(row[value])
-                props["value"] = v
-                vals.append(v)
-            feats.append({"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [coords]}, "properties": props})
-        col = _colormap(vals, cmap)
+        vals = df[value].cast(pl.Float64) if value is not None else None
+        props: list[dict[str, Any]] = (
+            [{"value": v} for v in vals.to_list()] if vals is not None else [{} for _ in range(df.height)]
+        )
+        cells = df[h3_col].cast(pl.Utf8).to_list()
+        # Aggregations often repeat a cell across rows (e.g. per hour); compute each ring once.
+        rings = {cell: _h3_ring(cell) for cell in dict.fromkeys(cells)}
+        feats = [
+            {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [rings[cell]]}, "properties": p}
+            for cell, p in zip(cells, props)
+        ]
+        col = _colormap(vals, cmap, self._colormap_cache)
+        # Every fill computed up front in NumPy; style_fn just looks its value up.
+        fills: dict[float, str] = {}
+        if vals is not None:
+            present = vals.drop_nulls()
+            fills = dict(zip(present.to_list(), _vectorize_cmap(col, present.to_numpy(), "#3388ff")))
 
         def style_fn(feat: dict[str, Any]) -> dict[str, Any]:
             v = feat.get("properties", {}).get("value")
             return {
-                "fillColor": col(v) if v is not None else "#3388ff",
+                "fillColor": fills.get(v, "#3388ff") if v is not None else "#3388ff",
                 "color": "#000000",
                 "weight": 1,
                 "fillOpacity": fill_opacity,
@@ -578,8 +922,8 @@ class PoliumMap:
 
         GeoJson({"type": "FeatureCollection", "features": feats}, name=name, style_function=style_fn).add_to(self._map)
         if value is not None:
-            col.caption = name
-            col.add_to(self._map)
+            self._add_legend(col, name)
+        self._render_cache = None
         return self
 
     # ---------- Track + Range ring (AIS utilities) ----------
@@ -598,12 +942,23 @@ class PoliumMap:
         ant_path: bool = False,
         show_endpoints: bool = True,
         endpoint_color: str = "#000000",
+        simplify_tol_deg: float = 0.0,
     ) -> "PoliumMap":
-        """Draw a polyline through the points (in row order)."""
-        _ensure_latlon(df, lat, lon)
-        coords = [(float(r[lat]), float(r[lon])) for r in df.to_dicts()]
-        if not coords:
+        """
+        Draw a polyline through the points (in row order).
+        If `simplify_tol_deg` > 0, the line is Douglas-Peucker simplified first (requires shapely).
+        """
+        # (n, 2) [lat, lon] array straight from Polars in one conversion.
+        latlon = _latlon_arrays(df, lat, lon).T
+        if not len(latlon):
             return self
+        if simplify_tol_deg > 0 and len(latlon) > 2:
+            if not _HAS_SHAPELY:
+                raise RuntimeError("shapely required for track simplification. Install with: pip install shapely")
+            line = LineString(latlon[:, ::-1])
+            simplified = line.simplify(simplify_tol_deg, preserve_topology=False)
+            latlon = np.asarray(simplified.coords)[:, ::-1]
+        coords = latlon.tolist()
         if ant_path:
             AntPath(locations=coords, weight=weight, opacity=opacity, color=color).add_to(self._map)
         else:
@@ -619,6 +974,7 @@ class PoliumMap:
             # start (green), end (red)
             folium.CircleMarker(coords[0], radius=5, color="#2ca25f", fill=True, fill_opacity=1).add_to(self._map)
             folium.CircleMarker(coords[-1], radius=5, color="#de2d26", fill=True, fill_opacity=1).add_to(self._map)
+        self._render_cache = None
         return self
 
     def add_range_ring(
@@ -634,7 +990,7 @@ class PoliumMap:
         n: int = 256,
         tooltip: Optional[str] = None,
     ) -> "PoliumMap":
-        """Geodesic ring polygon; requires pyproj."""
+        """Geodesic ring polygon; requires pyproj (or numba)."""
         lat, lon = float(center[0]), float(center[1])
         ring = _geodesic_circle(lon=lon, lat=lat, radius_m=radius_m, n=n)
         gj = GeoJson(
@@ -651,16 +1007,30 @@ class PoliumMap:
             gj.add_child(folium.Tooltip(tooltip))
         gj.add_to(self._map)
         folium.CircleMarker((lat, lon), radius=4, color=line_color, fill=True, fill_opacity=1).add_to(self._map)
+        self._render_cache = None
         return self
 
     # ---------- Output / control ----------
 
     def add_layer_control(self, collapsed: bool = False) -> "PoliumMap":
         folium.LayerControl(position="topright", collapsed=collapsed).add_to(self._map)
+        self._render_cache = None
         return self
 
     def to_html(self) -> str:
-        return self._map.get_root().render()
+        """
+        Render the map to HTML. The result is cached until an `add_*` call, a child
+        added to or removed from the map, or a child added to the figure's header,
+        html or script sections (e.g. `folium_map.get_root().header.add_child(...)`).
+        In-place edits to existing folium elements are not detected.
+        """
+        key = _tree_fingerprint(self._map)
+        if self._render_cache is not None and self._render_cache[0] == key:
+            return self._render_cache[1]
+        html = self._map.get_root().render()
+        # Rendering attaches helper children (e.g. "<name>_add"), so key on the post-render tree.
+        self._render_cache = (_tree_fingerprint(self._map), html)
+        return html
 
     def save(
         self,
@@ -703,17 +1073,15 @@ class PoliumMap:
                 )
 
         if strict_offline:
-            external_calls = [
-                u for u in re.findall(r"""["'](https?://[^"']+)["']""", html)
-                if not u.startswith("http://127.0.0.1") and not u.startswith("http://localhost")
-            ]
+            external_calls = _EXTERNAL_URL_RE.findall(html)
             if external_calls:
                 raise RuntimeError(
                     "External URLs still present:\n  - " + "\n  - ".join(external_calls)
                     + "\nProvide local assets via offline_assets_dir or assets_map."
                 )
 
-        Path(path).write_text(html, encoding="utf-8")
+        # One encode + one write; skips the text-IO layer (and newline translation).
+        Path(path).write_bytes(html.encode("utf-8"))
         return path
 
 